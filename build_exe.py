@@ -13,21 +13,29 @@ def main():
     # 获取当前脚本所在目录
     current_dir = Path(__file__).parent.absolute()
     
-    # 设置图标路径
-    icon_path = current_dir / 'heshui' / 'resources' / 'icons' / 'drink.ico'
+    # 已有 spec 文件时直接复用，跳过依赖分析阶段；传入 --rebuild 可重新生成
+    spec_path = current_dir / '喝水提醒.spec'
+    if spec_path.exists() and '--rebuild' not in sys.argv[1:]:
+        PyInstaller.__main__.run([str(spec_path), '--noconfirm'])
+        return
+    
+    # 设置图标路径，使用绝对路径，从任意目录运行本脚本都能找到
+    icons_dir = current_dir / 'heshui' / 'resources' / 'icons'
+    icon_path = icons_dir / 'drink.ico'
     
     # 根据操作系统设置路径分隔符
     separator = ';' if os.name == 'nt' else ':'
     
     # 设置打包参数
     params = [
-        'run.py',  # 主程序文件
+        str(current_dir / 'run.py'),  # 主程序文件
         '--name=喝水提醒',  # 可执行文件名称
         '--noconsole',  # 不显示控制台窗口
         f'--icon={icon_path}',  # 设置应用图标
         '--noconfirm',  # 覆盖输出目录
+        f'--specpath={current_dir}',  # spec 文件写到脚本目录，下次打包时才能找到并复用
         '--clean',  # 清理临时文件
-        f'--add-data=heshui/resources/icons{separator}heshui/resources/icons',  # 添加资源文件
+        f'--add-data={icons_dir}{separator}heshui/resources/icons',  # 添加资源文件
         '--hidden-import=PyQt6.QtSvg',  # 添加必要的隐藏导入
         '--hidden-import=PyQt6.QtSvgWidgets',
         '--hidden-import=matplotlib',
@@ -40,7 +48,18 @@ def main():
         '--hidden-import=pythoncom',
         '--exclude-module=tkinter',  # 排除不需要的模块
         '--exclude-module=numpy.random._examples',
-        '--onefile',  # 打包成单个文件
+        '--exclude-module=numpy.tests',
+        '--exclude-module=matplotlib.tests',
+        '--exclude-module=PyQt5',  # 排除其他 Qt 绑定，避免 matplotlib 间接引入
+        '--exclude-module=PySide2',
+        '--exclude-module=PySide6',
+        '--exclude-module=IPython',
+        '--exclude-module=tornado',
+        '--exclude-module=pytest',
+        '--exclude-module=pydoc_data',
+        '--exclude-module=lib2to3',
+        '--exclude-module=setuptools',
+        '--onedir',  # 打包成目录，避免单文件模式每次启动都要解压到临时目录
     ]
     
     # 执行打包
@@ -3,7 +3,7 @@
 一个基于 PyQt5 的喝水提醒软件，帮助用户保持良好的饮水习惯。
 """
 
-from .main import main
+from .main import excepthook, main
 
 __version__ = '0.1.0'
-__all__ = ['main']
+__all__ = ['excepthook', 'main']
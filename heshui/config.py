@@ -8,6 +8,28 @@ from pathlib import Path
 from typing import Any, Dict
 
 from appdirs import user_config_dir
+from PyQt6.QtCore import QTimer
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(data: bytes) -> Any:
+    """解析 JSON 字节串，优先使用 orjson。"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _dumps(obj: Any) -> bytes:
+    """将对象序列化为 UTF-8 编码的 JSON 字节串，优先使用 orjson。"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
 
 class Config:
     """配置管理类。
@@ -15,6 +37,10 @@ class Config:
     负责管理应用程序配置的单例类。
     """
     
+    # PyQt 连接绑定方法时需要弱引用，因此保留 __weakref__
+    __slots__ = ('config_dir', 'config_file', '_config', '_flush_timer', '_dirty',
+                 '__weakref__')
+    
     _instance = None
     _default_config = {
         "daily_goal": 2000,  # 每日目标饮水量（ml）
@@ -23,6 +49,7 @@ class Config:
         "start_minimized": False,  # 是否以最小化方式启动
         "autostart": False,  # 是否开机自启动
     }
+    _flush_delay = 500  # 合并写入的延迟（毫秒）
     
     def __new__(cls) -> 'Config':
         if cls._instance is None:
@@ -36,30 +63,60 @@ class Config:
         self.config_file = self.config_dir / "config.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.load_config()
+        
+        # 使用单次定时器合并短时间内的多次写入
+        self._dirty = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
     
     def load_config(self) -> None:
         """从文件加载配置。"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
-                    # 移除旧的 reminder_interval 配置项
-                    if 'reminder_interval' in loaded_config:
-                        del loaded_config['reminder_interval']
-                    self._config = {**self._default_config, **loaded_config}
+                loaded_config = _loads(self.config_file.read_bytes())
+                # 移除旧的 reminder_interval 配置项
+                if 'reminder_interval' in loaded_config:
+                    del loaded_config['reminder_interval']
+                self._config = {**self._default_config, **loaded_config}
             else:
                 self._config = self._default_config.copy()
         except Exception:
             self._config = self._default_config.copy()
     
     def save_config(self) -> None:
-        """保存配置到文件。"""
+        """保存配置到文件。
+        
+        先写入临时文件再替换，避免写入中断导致配置文件损坏。
+        """
+        tmp_file = self.config_file.with_name(self.config_file.name + '.tmp')
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, ensure_ascii=False, indent=2)
+            # 一次性序列化后单次写入，减少系统调用
+            data = _dumps(self._config)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+            fd = os.open(tmp_file, flags, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, self.config_file)
         except Exception as e:
             print(f"保存配置文件失败: {e}")
     
+    def _flush(self) -> None:
+        """将未保存的配置写入文件。"""
+        if self._dirty:
+            self._dirty = False
+            self.save_config()
+    
+    def flush(self) -> None:
+        """立即写入所有待保存的配置。
+        
+        应在程序退出前调用，确保延迟写入的配置不会丢失。
+        """
+        self._flush_timer.stop()
+        self._flush()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置项值。
         
@@ -72,6 +129,11 @@ class Config:
         """
         return self._config.get(key, default)
     
+    @property
+    def mute(self) -> bool:
+        """是否静音提醒。"""
+        return self._config['mute']
+    
     def set(self, key: str, value: Any) -> None:
         """设置配置项值。
         
@@ -79,8 +141,30 @@ class Config:
             key: 配置项键名
             value: 配置项的新值
         """
+        # 值未变化时无需写入
+        if key in self._config and self._config[key] == value:
+            return
         self._config[key] = value
-        self.save_config()
+        self._dirty = True
+        self._flush_timer.start(self._flush_delay)
+    
+    def update(self, new_settings: Dict[str, Any]) -> None:
+        """批量设置多个配置项。
+        
+        所有变化合并为一次延迟写入。
+        
+        Args:
+            new_settings: 要更新的配置项字典
+        """
+        changed = {
+            key: value for key, value in new_settings.items()
+            if key not in self._config or self._config[key] != value
+        }
+        if not changed:
+            return
+        self._config.update(changed)
+        self._dirty = True
+        self._flush_timer.start(self._flush_delay)
     
     def get_all(self) -> Dict[str, Any]:
         """获取所有配置项。
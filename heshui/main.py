@@ -3,13 +3,16 @@
 包含主窗口和系统托盘的实现。
 """
 import sys
+from bisect import bisect_right
 from datetime import datetime, timedelta, time
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import os
+import traceback
 from pathlib import Path
 
-from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QIcon, QPainter, QAction, QConicalGradient, QColor, QPen
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QSize, QPointF, QEvent
+from PyQt6.QtGui import (QIcon, QPainter, QAction, QConicalGradient, QColor, QPen,
+                         QFont, QFontMetrics, QFontMetricsF, QPalette, QPixmap)
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QMenu, QSystemTrayIcon,
                            QWidget, QVBoxLayout, QPushButton, QLabel,
                            QProgressBar, QMessageBox, QHBoxLayout, QDialog,
@@ -17,10 +20,85 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QMenu, QSystemTrayIcon,
 
 from heshui.config import Config
 from heshui.models import DatabaseManager
-from heshui.settings import SettingsDialog
 from heshui.stats import StatsTabWidget
 
 
+# 渐变色停靠点的颜色，0到1之间共11个点，从浅蓝过渡到主题蓝。
+# 按 sin(pos * pi / 2) 插值预先算好，使过渡更自然
+_GRADIENT_RGB = (
+    (179, 229, 252),
+    (156, 216, 250),
+    (133, 204, 249),
+    (112, 193, 247),
+    (93, 182, 246),
+    (75, 173, 245),
+    (60, 165, 244),
+    (48, 158, 243),
+    (40, 153, 243),
+    (34, 150, 243),
+    (33, 150, 243),
+)
+_GRADIENT_STOPS = tuple((i / 10, QColor(*rgb)) for i, rgb in enumerate(_GRADIENT_RGB))
+
+
+def _create_gradient() -> QConicalGradient:
+    """创建圆锥渐变。"""
+    gradient = QConicalGradient(0.5, 0.5, 90)
+    gradient.setCoordinateMode(gradient.CoordinateMode.ObjectBoundingMode)
+    
+    # 使用更多的渐变点来实现更平滑的过渡
+    for pos, color in _GRADIENT_STOPS:
+        gradient.setColorAt(pos, color)
+    
+    return gradient
+
+
+# 所有环形进度条共享的渐变
+_SHARED_GRADIENT = _create_gradient()
+
+# 模块所在目录及图标文件路径
+_MODULE_DIR = Path(__file__).resolve().parent
+_ICON_DIR = _MODULE_DIR / 'resources' / 'icons'
+_DRINK_ICO = str(_ICON_DIR / 'drink.ico')
+_CHART_SVG = str(_ICON_DIR / 'chart.svg')
+_SETTINGS_SVG = str(_ICON_DIR / 'settings.svg')
+
+# 已加载的图标，按文件路径缓存，每个图标文件在进程内只解码一次
+_ICON_CACHE: Dict[str, QIcon] = {}
+
+
+def load_icon(path: str) -> QIcon:
+    """加载图标（带缓存）。
+    
+    图标需要在 QApplication 创建之后加载。
+    
+    Args:
+        path: 图标文件路径
+        
+    Returns:
+        QIcon: 共享的图标实例
+    """
+    icon = _ICON_CACHE.get(path)
+    if icon is None:
+        icon = _ICON_CACHE[path] = QIcon(path)
+    return icon
+
+
+def drink_icon() -> QIcon:
+    """获取应用程序图标。
+    
+    Returns:
+        QIcon: 窗口和托盘共用的图标实例
+    """
+    return load_icon(_DRINK_ICO)
+
+
+def _set_label_text(label: QLabel, text: str) -> None:
+    """设置标签文本，文本未变化时跳过，避免不必要的重新布局和重绘。"""
+    if label.text() != text:
+        label.setText(text)
+
+
 class CircularProgress(QWidget):
     """环形进度条控件。
     
@@ -30,10 +108,17 @@ class CircularProgress(QWidget):
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.value = 0
+        # 当前显示的整数进度和圆弧角度，与 value 保持一致
+        self._last_int = 0
+        self._last_span = 0
         self.setMinimumSize(200, 200)
         
+        # 背景由缓存图像完整覆盖，无需 Qt 预先擦除或填充控件区域
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        self.setAutoFillBackground(False)
+        
         # 设置渐变色
-        self.gradient = self._create_gradient()
+        self.gradient = _SHARED_GRADIENT
         
         # 进度条样式参数
         self.ring_width = 12  # 圆环宽度调整得更细一些
@@ -41,110 +126,190 @@ class CircularProgress(QWidget):
         
         # 设置主题色
         self.theme_color = QColor(33, 150, 243)  # 设置统一的主题色
-    
-    def _create_gradient(self) -> 'QConicalGradient':
-        """创建圆锥渐变。"""
-        gradient = QConicalGradient(0.5, 0.5, 90)
-        gradient.setCoordinateMode(gradient.CoordinateMode.ObjectBoundingMode)
-        
-        # 使用更多的渐变点来实现更平滑的过渡
-        # 使用更多的中间点，让渐变更加平滑
-        for i in range(11):  # 0到1之间创建11个点
-            pos = i / 10
-            # 使用正弦函数创建更平滑的渐变
-            import math
-            t = math.sin(pos * math.pi / 2)  # 使用正弦函数使过渡更自然
-            
-            # 计算颜色
-            r = int(179 + (33 - 179) * t)  # 从浅蓝到主题蓝
-            g = int(229 + (150 - 229) * t)
-            b = int(252 + (243 - 252) * t)
-            
-            gradient.setColorAt(pos, QColor(r, g, b))
         
-        return gradient
+        # 背景圆环画笔
+        self._bg_pen = QPen()
+        self._bg_pen.setWidth(self.ring_width)
+        self._bg_pen.setColor(QColor(238, 238, 238))  # 使用更浅的灰色
+        self._bg_pen.setCapStyle(Qt.PenCapStyle.RoundCap)  # 背景也使用圆形线帽
+        
+        # 渐变画笔
+        self._gradient_pen = QPen()
+        self._gradient_pen.setWidth(self.ring_width)
+        self._gradient_pen.setBrush(self.gradient)
+        self._gradient_pen.setCapStyle(Qt.PenCapStyle.RoundCap)  # 添加圆形线帽
+        
+        # 背景圆环缓存，按控件尺寸和设备像素比生成
+        self._bg_pixmap: Optional[QPixmap] = None
+        self._bg_pixmap_key = None
+        
+        # 按控件边长缓存的字体及文字度量
+        self._font_cache: Dict[int, tuple] = {}
+        self._updatePaintCache()
     
     def setValue(self, value: float) -> None:
         """设置进度值（0-100）。"""
-        self.value = max(0, min(value, 100))
+        value = max(0, min(value, 100))
+        new_int = int(value)
+        new_span = int(-value * 360 / 100)
+        # 显示的整数和圆弧角度都未变化时，画面不会有任何不同，跳过重绘
+        if (new_int == self._last_int and new_span == self._last_span
+                and (value > 0) == (self.value > 0)):
+            return
+        self.value = value
+        self._last_int = new_int
+        self._last_span = new_span
         self.update()
     
-    def paintEvent(self, event) -> None:
-        """绘制环形进度条。"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def resizeEvent(self, event) -> None:
+        """尺寸变化时重新计算绘制缓存。"""
+        super().resizeEvent(event)
+        self._bg_pixmap = None
+        self._updatePaintCache()
+    
+    def _backgroundPixmap(self) -> QPixmap:
+        """获取背景圆环的缓存图像，尺寸或设备像素比变化时重新绘制。
+        
+        图像先用窗口背景色填满，绘制时可以直接覆盖整个控件区域。
+        """
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self._bg_pixmap is None or self._bg_pixmap_key != key:
+            pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(self.palette().color(QPalette.ColorRole.Window))
+            
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(self._bg_pen)
+            painter.drawEllipse(self._rect)
+            painter.end()
+            
+            self._bg_pixmap = pixmap
+            self._bg_pixmap_key = key
+        return self._bg_pixmap
+    
+    def _updatePaintCache(self) -> None:
+        """预先计算绘制所需的区域、字体和文字度量。
         
-        # 计算绘制区域
+        这些对象只与控件尺寸有关，在尺寸变化时计算一次，避免每次重绘时重复创建。
+        字体按边长缓存，恢复到之前的尺寸时直接复用。
+        """
         side = min(self.width(), self.height())
-        rect = self.rect().adjusted(
+        self._side = side
+        self._rect = self.rect().adjusted(
             self.ring_width, 
             self.ring_width, 
             -self.ring_width, 
             -self.ring_width
         )
         
+        entry = self._font_cache.get(side)
+        if entry is None:
+            entry = self._font_cache[side] = self._createFonts(side)
+        (self._number_font, self._percent_font, self._number_metrics,
+         self._percent_width, self._number_width_cache,
+         (number_height, number_ascent), (percent_height, percent_ascent)) = entry
+        
+        # 文字基线位置（与在绘制区域内垂直居中等效），绘制时只需设置水平位置
+        rect = self._rect
+        number_y = rect.y() + (rect.height() - number_height) / 2 + number_ascent
+        percent_y = rect.y() + side // 8 \
+            + (rect.height() - side // 8 - percent_height) / 2 \
+            + percent_ascent  # 百分号稍微向下调整
+        self._number_pos = QPointF(0, number_y)
+        self._percent_pos = QPointF(0, percent_y)
+    
+    def _createFonts(self, side: int) -> tuple:
+        """创建指定尺寸下的字体及文字度量。
+        
+        Args:
+            side: 控件的边长
+            
+        Returns:
+            tuple: 数字字体、百分号字体、数字字体度量、百分号宽度、数字宽度缓存，
+                以及数字和百分号的 (行高, 上行高度)
+        """
+        # 数字字体
+        number_font = QFont(self.font())
+        number_font.setPixelSize(side // 3)  # 调整数字大小
+        number_font.setBold(True)  # 设置为粗体
+        number_metrics_f = QFontMetricsF(number_font)
+        
+        # 百分号字体
+        percent_font = QFont(number_font)
+        percent_font.setPixelSize(side // 8)  # 百分号字体小一些
+        percent_metrics_f = QFontMetricsF(percent_font)
+        percent_width = QFontMetrics(percent_font).horizontalAdvance("%")
+        
+        return (
+            number_font,
+            percent_font,
+            QFontMetrics(number_font),
+            percent_width,
+            {},  # 数字宽度缓存，键为显示的整数值
+            (number_metrics_f.height(), number_metrics_f.ascent()),
+            (percent_metrics_f.height(), percent_metrics_f.ascent()),
+        )
+    
+    def changeEvent(self, event) -> None:
+        """字体或调色板变化时清除相应的缓存。"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.PaletteChange:
+            self._bg_pixmap = None
+            self.update()
+        elif event.type() == QEvent.Type.FontChange:
+            self._font_cache.clear()
+            self._updatePaintCache()
+            self.update()
+    
+    def _numberWidth(self, number: int) -> int:
+        """获取数字文本的宽度（带缓存）。"""
+        width = self._number_width_cache.get(number)
+        if width is None:
+            width = self._number_metrics.horizontalAdvance(str(number))
+            self._number_width_cache[number] = width
+        return width
+    
+    def paintEvent(self, event) -> None:
+        """绘制环形进度条。"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        side = self._side
+        rect = self._rect
+        
         # 绘制背景圆环
-        background_pen = QPen()
-        background_pen.setWidth(self.ring_width)
-        background_pen.setColor(QColor(238, 238, 238))  # 使用更浅的灰色
-        background_pen.setCapStyle(Qt.PenCapStyle.RoundCap)  # 背景也使用圆形线帽
-        painter.setPen(background_pen)
-        painter.drawEllipse(rect)
+        painter.drawPixmap(0, 0, self._backgroundPixmap())
         
         # 如果有进度，绘制进度圆环
         if self.value > 0:
-            # 设置渐变画笔
-            gradient_pen = QPen()
-            gradient_pen.setWidth(self.ring_width)
-            gradient_pen.setBrush(self.gradient)
-            gradient_pen.setCapStyle(Qt.PenCapStyle.RoundCap)  # 添加圆形线帽
-            painter.setPen(gradient_pen)
-            
-            # 计算角度
-            span_angle = int(-self.value * 360 / 100)
+            painter.setPen(self._gradient_pen)
             
-            # 绘制进度圆环
-            painter.drawArc(rect, self.start_angle * 16, span_angle * 16)
+            # 绘制进度圆环，角度已在 setValue 中计算
+            painter.drawArc(rect, self.start_angle * 16, self._last_span * 16)
         
         # 绘制中心文字
         painter.setPen(self.theme_color)  # 使用主题色绘制文字
         
         # 准备文本
-        number_text = f"{int(self.value)}"
-        
-        # 设置数字字体
-        number_font = painter.font()
-        number_font.setPixelSize(side // 3)  # 调整数字大小
-        number_font.setBold(True)  # 设置为粗体
-        painter.setFont(number_font)
-        
-        # 计算数字宽度
-        metrics = painter.fontMetrics()
-        number_width = metrics.horizontalAdvance(number_text)
-        
-        # 设置百分号字体
-        percent_font = painter.font()
-        percent_font.setPixelSize(side // 8)  # 百分号字体小一些
-        
-        # 计算百分号宽度
-        painter.setFont(percent_font)
-        percent_width = painter.fontMetrics().horizontalAdvance("%")
+        number = self._last_int
+        number_text = f"{number}"
+        number_width = self._numberWidth(number)
         
         # 计算总宽度和起始位置
-        total_width = number_width + percent_width + side // 20  # 添加一些间距
+        total_width = number_width + self._percent_width + side // 20  # 添加一些间距
         start_x = (side - total_width) // 2
         
         # 绘制数字
-        painter.setFont(number_font)
-        number_rect = rect.adjusted(0, 0, 0, 0)
-        number_rect.moveLeft(start_x)
-        painter.drawText(number_rect, int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), number_text)
+        painter.setFont(self._number_font)
+        self._number_pos.setX(start_x)
+        painter.drawText(self._number_pos, number_text)
         
         # 绘制百分号
-        painter.setFont(percent_font)
-        percent_rect = rect.adjusted(0, side//8, 0, 0)  # 稍微向下调整
-        percent_rect.moveLeft(start_x + number_width + side//20)  # 添加间距
-        painter.drawText(percent_rect, int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), "%")
+        painter.setFont(self._percent_font)
+        self._percent_pos.setX(start_x + number_width + side//20)  # 添加间距
+        painter.drawText(self._percent_pos, "%")
 
 
 class StatsDialog(QDialog):
@@ -261,20 +426,46 @@ class MainWindow(QMainWindow):
     
     drink_recorded = pyqtSignal()  # 记录饮水信号
     
+    # 提醒定时器单次等待的最长时间（毫秒），用于应对系统休眠或时间调整
+    MAX_REMINDER_WAIT = 6 * 60 * 60 * 1000
+    # 定时器可能提前触发的容差，VeryCoarseTimer 的精度为 1 秒
+    REMINDER_TOLERANCE = timedelta(seconds=1)
+    # 提醒触发时间晚于计划超过此时长（如系统休眠后唤醒）则不再补发
+    REMINDER_LATE_LIMIT = timedelta(minutes=1)
+    
     def __init__(self):
         super().__init__()
         self.config = Config()
-        self.db = DatabaseManager()
+        # 数据库在事件循环启动后再初始化，缩短窗口显示前的等待时间
+        self.db: Optional[DatabaseManager] = None
+        
+        # 今日饮水总量缓存，仅在记录饮水或日期变化时更新
+        self._total_today_cache: Optional[int] = None
+        self._total_today_date = None
+        # 已交给后台线程但尚未写入数据库的饮水量
+        self._pending_amount = 0
+        
+        # 设置对话框，首次打开时创建
+        self._settings_dialog = None
+        
         self.initUI()
         self.setupSystemTray()
         self.setupTimer()
+        QTimer.singleShot(0, self._init_db)
         
         # 设置应用程序图标
-        icon_path = Path(__file__).parent / 'resources' / 'icons' / 'drink.ico'
-        self.setWindowIcon(QIcon(str(icon_path)))
-        
-        # 上次提醒的时间点，用于避免重复提醒
-        self.last_reminder_time = None
+        self.setWindowIcon(drink_icon())
+    
+    def _init_db(self) -> None:
+        """初始化数据库并刷新界面显示。"""
+        self.db = DatabaseManager.instance()
+        writer = self.db.get_writer()
+        writer.recorded.connect(self.onDrinkRecorded)
+        writer.failed.connect(self.onDrinkRecordFailed)
+        # 退出前写入尚未提交的饮水记录并停止写入线程
+        QApplication.instance().aboutToQuit.connect(self.db.stop_writer)
+        self.updateStatus()
+        self.scheduleNextReminder()
     
     def initUI(self) -> None:
         """初始化用户界面。"""
@@ -304,8 +495,7 @@ class MainWindow(QMainWindow):
             }
         """)
         # 使用 SVG 图标
-        icon_path = Path(__file__).parent / 'resources' / 'icons' / 'chart.svg'
-        stats_btn.setIcon(QIcon(str(icon_path)))
+        stats_btn.setIcon(load_icon(_CHART_SVG))
         stats_btn.setIconSize(QSize(20, 20))
         stats_btn.setToolTip("查看统计")
         stats_btn.clicked.connect(self.showStats)
@@ -325,8 +515,7 @@ class MainWindow(QMainWindow):
             }
         """)
         # 使用 SVG 图标
-        icon_path = Path(__file__).parent / 'resources' / 'icons' / 'settings.svg'
-        settings_btn.setIcon(QIcon(str(icon_path)))
+        settings_btn.setIcon(load_icon(_SETTINGS_SVG))
         settings_btn.setIconSize(QSize(20, 20))  # 设置图标大小
         settings_btn.setToolTip("设置")
         settings_btn.clicked.connect(self.showSettings)
@@ -356,9 +545,8 @@ class MainWindow(QMainWindow):
     def setupSystemTray(self) -> None:
         """设置系统托盘。"""
         self.tray_icon = QSystemTrayIcon(self)
-        # 使用文件系统中的图标
-        icon_path = Path(__file__).parent / 'resources' / 'icons' / 'drink.ico'
-        self.tray_icon.setIcon(QIcon(str(icon_path)))
+        # 与窗口共用同一个图标实例
+        self.tray_icon.setIcon(drink_icon())
         
         # 创建托盘菜单
         tray_menu = QMenu()
@@ -374,7 +562,7 @@ class MainWindow(QMainWindow):
         
         self.mute_action = QAction('静音提醒', self)
         self.mute_action.setCheckable(True)
-        self.mute_action.setChecked(self.config.get('mute'))
+        self.mute_action.setChecked(self.config.mute)
         self.mute_action.triggered.connect(self.toggleMute)
         tray_menu.addAction(self.mute_action)
         
@@ -391,75 +579,158 @@ class MainWindow(QMainWindow):
     
     def setupTimer(self) -> None:
         """设置定时器。"""
+        # 提醒定时器只在下一个提醒时间点触发，不再每分钟轮询
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.checkReminderTimes)
-        # 每分钟检查一次
-        self.timer.start(60 * 1000)  # 60秒 = 1分钟
+        self.timer.setSingleShot(True)
+        # 提醒只需要秒级精度，允许系统合并唤醒以降低空闲时的 CPU 占用
+        self.timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.timer.timeout.connect(self.onReminderDue)
+        
+        # 定时器等待的提醒时间
+        self._next_reminder: Optional[datetime] = None
+        
+        # 零点时清除今日饮水量缓存
+        self.midnight_timer = QTimer(self)
+        self.midnight_timer.setSingleShot(True)
+        self.midnight_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.midnight_timer.timeout.connect(self.onMidnight)
+        self.scheduleMidnightTimer()
+    
+    def scheduleMidnightTimer(self) -> None:
+        """启动定时器，在下一个零点触发。"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        self.midnight_timer.start(int((midnight - now).total_seconds() * 1000) + 1000)
+    
+    def onMidnight(self) -> None:
+        """日期变化时清除缓存并刷新显示。"""
+        self._total_today_cache = None
+        self.updateStatus()
+        self.scheduleMidnightTimer()
+    
+    def scheduleNextReminder(self, after: Optional[datetime] = None) -> None:
+        """启动提醒定时器，在下一个提醒时间点触发。
+        
+        Args:
+            after: 查找此时间之后的提醒，默认为当前时间
+        """
+        if self.db is None:
+            return
+        
+        self._next_reminder = self.getNextReminderTime(after)
+        if self._next_reminder is None:
+            self.timer.stop()
+        else:
+            delay = int((self._next_reminder - datetime.now()).total_seconds() * 1000)
+            self.timer.start(max(0, min(delay, self.MAX_REMINDER_WAIT)))
         
-        # 初始显示下一次提醒时间
         self.updateNextReminderDisplay()
     
-    def checkReminderTimes(self) -> None:
-        """检查当前时间是否匹配任何提醒时间点。"""
-        current_time = datetime.now().time()
-        current_time = time(current_time.hour, current_time.minute)
-        
-        # 获取所有提醒时间点
-        reminder_times = self.db.get_reminder_times()
-        
-        # 检查当前时间是否匹配任何提醒时间点
-        for reminder_time in reminder_times:
-            if (current_time.hour == reminder_time.hour and 
-                current_time.minute == reminder_time.minute):
-                # 避免在同一分钟内重复提醒
-                if self.last_reminder_time != current_time:
-                    self.showReminder()
-                    self.last_reminder_time = current_time
-                break
-        
-        # 更新下一次提醒时间显示
-        self.updateNextReminderDisplay()
+    def onReminderDue(self) -> None:
+        """提醒定时器触发时的处理函数。"""
+        due = self._next_reminder
+        now = datetime.now()
+        if due is not None and now + self.REMINDER_TOLERANCE >= due:
+            if now - due <= self.REMINDER_LATE_LIMIT:
+                self.showReminder()
+            # 从本次提醒和当前时间中较晚者之后开始查找，
+            # 既避免提前触发时重复提醒，也不会补发唤醒前错过的提醒
+            self.scheduleNextReminder(after=max(due, now))
+        else:
+            # 等待时间被截断或系统时间发生变化，重新计算
+            self.scheduleNextReminder()
     
     def updateNextReminderDisplay(self) -> None:
         """更新下一次提醒时间显示。"""
-        next_time = self.getNextReminderTime()
+        if self.db is None:
+            return
+        
+        next_time = self._next_reminder
         if next_time:
-            self.next_reminder_label.setText(f'下次提醒: {next_time.strftime("%H:%M")}')
+            text = f'下次提醒: {next_time.hour:02d}:{next_time.minute:02d}'
         else:
-            self.next_reminder_label.setText('没有设置提醒时间')
+            text = '没有设置提醒时间'
+        _set_label_text(self.next_reminder_label, text)
     
-    def getNextReminderTime(self) -> datetime:
+    def getNextReminderTime(self, after: Optional[datetime] = None) -> Optional[datetime]:
         """获取下一次提醒时间。
         
+        Args:
+            after: 查找此时间之后的提醒，默认为当前时间
+            
         Returns:
             datetime: 下一次提醒时间，如果没有设置提醒时间则返回 None
         """
-        current_time = datetime.now()
+        current_time = after or datetime.now()
         current_time_only = current_time.time()
         
-        # 获取所有提醒时间点
-        reminder_times = sorted(self.db.get_reminder_times())
+        # 获取所有提醒时间点（已排序）
+        reminder_times = self.getReminderTimes()
         if not reminder_times:
             return None
         
-        # 查找今天的下一个提醒时间点
-        for t in reminder_times:
-            if t > current_time_only:
-                next_time = datetime.combine(current_time.date(), t)
-                return next_time
+        # 二分查找今天的下一个提醒时间点
+        index = bisect_right(reminder_times, current_time_only)
+        if index < len(reminder_times):
+            return datetime.combine(current_time.date(), reminder_times[index])
         
         # 如果今天没有更多提醒，则返回明天的第一个提醒
         next_time = datetime.combine(current_time.date() + timedelta(days=1), reminder_times[0])
         return next_time
     
+    def getReminderTimes(self) -> Tuple[time, ...]:
+        """获取按时间排序的提醒时间点。
+        
+        数据库管理器会缓存提醒时间点，修改后自动重新加载。
+        
+        Returns:
+            Tuple[time, ...]: 提醒时间点
+        """
+        return self.db.get_reminder_times()
+    
     def updateStatus(self) -> None:
         """更新状态显示。"""
-        total = self.db.get_total_today()
+        if self.db is None:
+            return
+        
+        today = datetime.now().date()
+        if self._total_today_cache is None or self._total_today_date != today:
+            # 同时加载提醒时间点缓存，与今日总量共用一次数据库会话
+            self._total_today_cache, _ = self.db.get_dashboard_state()
+            self._total_today_date = today
+        total = self._total_today_cache + self._pending_amount
         goal = self.config.get('daily_goal')
         progress = min(100, total * 100 / goal)
         
         self.progress.setValue(progress)
-        self.status_label.setText(f'今日已饮水: {total}ml / {goal}ml')
+        _set_label_text(self.status_label, f'今日已饮水: {total}ml / {goal}ml')
+    
+    def onDrinkRecorded(self, amount: int) -> None:
+        """饮水记录写入数据库后，以数据库中的数据刷新显示。
+        
+        Args:
+            amount: 本次写入的总饮水量(ml)
+        """
+        self._pending_amount -= amount
+        self._total_today_cache = None
+        self.updateStatus()
+    
+    def onDrinkRecordFailed(self, amount: int, message: str) -> None:
+        """饮水记录写入数据库失败时，撤销界面上的累加并提示错误。
+        
+        Args:
+            amount: 写入失败的总饮水量(ml)
+            message: 错误信息
+        """
+        self._pending_amount -= amount
+        self._total_today_cache = None
+        self.updateStatus()
+        QMessageBox.critical(
+            self,
+            "错误",
+            f"记录饮水时出错: {message}",
+            QMessageBox.StandardButton.Ok
+        )
     
     def recordDrink(self) -> None:
         """记录饮水。
@@ -473,19 +744,15 @@ class MainWindow(QMainWindow):
                 # 获取用户选择的饮水量
                 amount = dialog.get_amount()
                 
-                # 记录到数据库
-                self.db.add_record(amount)
+                # 交给后台线程写入数据库，先在界面上累加以立即反馈
+                self.db.enqueue_add_record(amount)
+                self._pending_amount += amount
                 self.updateStatus()
                 self.updateNextReminderDisplay()  # 更新下一次提醒时间显示
                 self.drink_recorded.emit()
                 
                 # 显示成功提示
-                self.tray_icon.showMessage(
-                    '记录成功',
-                    f'已记录饮水 {amount}ml',
-                    QSystemTrayIcon.MessageIcon.Information,
-                    2000
-                )
+                self.showTrayMessage('记录成功', f'已记录饮水 {amount}ml')
         except Exception as e:
             # 显示错误消息
             QMessageBox.critical(
@@ -495,15 +762,22 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.Ok
             )
     
+    def showTrayMessage(self, title: str, message: str, msecs: int = 2000) -> None:
+        """在系统托盘显示通知消息。
+        
+        Args:
+            title: 消息标题
+            message: 消息内容
+            msecs: 显示时长（毫秒）
+        """
+        self.tray_icon.showMessage(
+            title, message, QSystemTrayIcon.MessageIcon.Information, msecs
+        )
+    
     def showReminder(self) -> None:
         """显示提醒。"""
-        if not self.config.get('mute'):
-            self.tray_icon.showMessage(
-                '喝水提醒',
-                self.config.get('reminder_text'),
-                QSystemTrayIcon.MessageIcon.Information,
-                3000
-            )
+        if not self.config.mute:
+            self.showTrayMessage('喝水提醒', self.config.get('reminder_text'), 3000)
     
     def toggleMute(self, checked: bool) -> None:
         """切换静音状态。"""
@@ -511,13 +785,21 @@ class MainWindow(QMainWindow):
     
     def showSettings(self) -> None:
         """显示设置对话框。"""
-        dialog = SettingsDialog(self)
+        from heshui.settings import SettingsDialog
+        
+        # 对话框首次打开时创建，之后复用并重新加载当前设置
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self)
+        else:
+            self._settings_dialog.loadSettings()
+        
+        dialog = self._settings_dialog
         if dialog.exec() == SettingsDialog.DialogCode.Accepted:  # 注意这里的改动
             # 更新UI显示
             self.updateStatus()
-            self.updateNextReminderDisplay()  # 更新下一次提醒时间显示
+            self.scheduleNextReminder()  # 按新的提醒时间点重新设置定时器
             # 更新托盘菜单的静音状态
-            self.mute_action.setChecked(self.config.get('mute'))
+            self.mute_action.setChecked(self.config.mute)
     
     def showStats(self) -> None:
         """显示统计对话框。"""
@@ -549,20 +831,41 @@ class MainWindow(QMainWindow):
         """处理窗口关闭事件。"""
         event.ignore()
         self.hide()
-        self.tray_icon.showMessage(
-            '喝水提醒',
-            '应用程序已最小化到系统托盘',
-            QSystemTrayIcon.MessageIcon.Information,
-            2000
+        self.config.flush()
+        self.showTrayMessage('喝水提醒', '应用程序已最小化到系统托盘')
+
+def excepthook(exc_type, exc_value, exc_traceback):
+    """全局异常处理函数。"""
+    # 完整的堆栈只写入标准错误，对话框中只显示一行摘要。
+    # 打包后无控制台运行时 sys.stderr 为 None，此时只显示对话框
+    if sys.stderr is not None:
+        print(f"发生未捕获的异常: {exc_type.__name__}: {exc_value}", file=sys.stderr)
+        traceback.print_exception(exc_type, exc_value, exc_traceback, file=sys.stderr)
+    if QApplication.instance():
+        QMessageBox.critical(
+            None, 
+            "错误", 
+            f"程序发生错误: {exc_type.__name__}: {exc_value}\n\n"
+            "请查看控制台输出获取详细信息。"
         )
 
-def main():
-    """应用程序入口函数。"""
+
+def main() -> int:
+    """应用程序入口函数。
+    
+    Returns:
+        int: 事件循环的退出码
+    """
+    # 设置全局异常处理器
+    sys.excepthook = excepthook
+    
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     
     window = MainWindow()
+    # 退出前写入延迟保存的配置
+    app.aboutToQuit.connect(window.config.flush)
     if not Config().get('start_minimized'):
         window.show()
     
-    sys.exit(app.exec()) 
\ No newline at end of file
+    return app.exec()
@@ -2,30 +2,80 @@
 
 包含所有与数据库相关的模型类定义。
 """
-from datetime import datetime, timedelta, time
-from typing import Optional, Dict, List, Tuple
-import sqlite3
+from datetime import date, datetime, timedelta, time
+from typing import Optional, Dict, List, Set, Tuple
+import queue
+import threading
+from time import monotonic as _monotonic
 
-from sqlalchemy import Column, DateTime, Integer, String, Time, create_engine, func
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from sqlalchemy import (Column, Index, Integer, String, Time, create_engine,
+                        delete, event, func, insert, text)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
 Base = declarative_base()
 
+
+def _to_epoch_ms(dt: datetime) -> int:
+    """将本地时间转换为 Unix 毫秒时间戳。"""
+    return int(dt.timestamp() * 1000)
+
+
+def _now_ms() -> int:
+    """获取当前时间的 Unix 毫秒时间戳。"""
+    return _to_epoch_ms(datetime.now())
+
+
+def _day_start_ms(day: date) -> int:
+    """获取指定日期零点的 Unix 毫秒时间戳。"""
+    return _to_epoch_ms(datetime.combine(day, time.min))
+
+
+# 按小时统计时使用的小时标签
+_HOUR_LABELS = tuple(f"{i:02d}:00" for i in range(24))
+
+# 数据库结构版本，保存在 SQLite 的 user_version 中，用于判断是否需要升级
+_SCHEMA_VERSION = 1
+
+# 保护 DatabaseManager 单例的创建，避免多个线程同时初始化数据库连接
+_singleton_lock = threading.Lock()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """为新建的 SQLite 连接设置 PRAGMA。
+    
+    使用 WAL 日志模式，提交时只追加写入日志文件，不必每次都同步整个数据库文件；
+    同时增大页缓存、使用内存映射读取并将临时表放在内存中。
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-50000")  # 约 50MB 页缓存
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB 内存映射
+    cursor.close()
+
+
 class DrinkRecord(Base):
     """饮水记录模型类。
     
     Attributes:
         id (int): 记录ID
-        timestamp (datetime): 记录时间
+        timestamp (int): 记录时间，Unix 毫秒时间戳
         amount (int): 饮水量(ml)
         note (str): 备注信息
     """
     
     __tablename__ = 'drink_records'
+    __table_args__ = (
+        # 覆盖索引：按时间范围统计饮水量时只需读取索引页
+        Index('ix_drink_records_timestamp_amount', 'timestamp', 'amount'),
+    )
     
     id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, nullable=False, default=datetime.now)
+    # 以整数存储时间，比较和按时间范围查询无需解析字符串
+    timestamp = Column(Integer, nullable=False, default=_now_ms)
     amount = Column(Integer, nullable=False)
     note = Column(String(200))
 
@@ -42,6 +92,79 @@ class ReminderTime(Base):
     id = Column(Integer, primary_key=True)
     time = Column(Time, nullable=False, unique=True)
 
+class DatabaseWriter(QObject):
+    """后台写入饮水记录的工作对象。
+    
+    在独立线程中从队列取出记录，并将短时间内的多条记录合并为一个事务提交，
+    避免数据库写入阻塞界面线程。
+    
+    Attributes:
+        recorded: 一批记录提交成功后发出，参数为本批记录的总饮水量(ml)
+        failed: 一批记录提交失败后发出，参数为本批记录的总饮水量(ml)和错误信息
+    """
+    
+    recorded = pyqtSignal(int)
+    failed = pyqtSignal(int, str)
+    
+    # 合并写入的等待时间（秒）
+    COALESCE_WINDOW = 0.05
+    
+    def __init__(self, session_factory: sessionmaker, write_queue: queue.Queue) -> None:
+        """初始化写入对象。
+        
+        Args:
+            session_factory: 创建数据库会话的工厂
+            write_queue: 待写入记录的队列，放入 None 表示停止
+        """
+        super().__init__()
+        self.Session = session_factory
+        self.queue = write_queue
+    
+    def run(self) -> None:
+        """持续处理队列中的记录，直到收到停止标记。"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            
+            # 在合并窗口内继续收集记录
+            batch = [item]
+            stop = False
+            deadline = _monotonic() + self.COALESCE_WINDOW
+            while True:
+                remaining = deadline - _monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            self._commit(batch)
+            if stop:
+                return
+    
+    def _commit(self, batch: List[Tuple[int, str, int]]) -> None:
+        """在一个事务中写入一批记录。"""
+        total = sum(amount for amount, _, _ in batch)
+        try:
+            with self.Session() as session:
+                session.add_all([
+                    DrinkRecord(amount=amount, note=note, timestamp=timestamp)
+                    for amount, note, timestamp in batch
+                ])
+                session.commit()
+        except Exception as e:
+            print(f"写入饮水记录时出错: {e}")
+            self.failed.emit(total, str(e))
+        else:
+            self.recorded.emit(total)
+
+
 class DatabaseManager:
     """数据库管理类。
     
@@ -52,19 +175,72 @@ class DatabaseManager:
     
     def __new__(cls) -> 'DatabaseManager':
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
+            with _singleton_lock:
+                # 加锁后再次检查，其他线程可能已完成创建
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
     
+    @classmethod
+    def instance(cls) -> 'DatabaseManager':
+        """获取进程内共享的数据库管理器。
+        
+        所有界面组件共用同一个引擎和连接池。实例应只在 Qt 主线程中使用，
+        饮水记录的后台写入由 DatabaseWriter 在自己的线程和会话中完成。
+        
+        Returns:
+            DatabaseManager: 共享的数据库管理器实例
+        """
+        return cls._instance or cls()
+    
     def _initialize(self) -> None:
         """初始化数据库连接和会话。"""
-        self.engine = create_engine('sqlite:///drink_records.db')
+        self.engine = create_engine(
+            'sqlite:///drink_records.db',
+            connect_args={"check_same_thread": False},
+            pool_pre_ping=False,
+        )
+        event.listen(self.engine, 'connect', _set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
+        self._migrate()
         self.Session = sessionmaker(bind=self.engine)
         
+        # 后台写入线程在首次写入时创建
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer: Optional[DatabaseWriter] = None
+        self._writer_thread: Optional[QThread] = None
+        
+        # 按时间排序的提醒时间点缓存，修改提醒时间点时失效
+        self._reminder_cache: Optional[Tuple[time, ...]] = None
+        
         # 如果没有设置提醒时间点，添加默认时间点
         self._add_default_reminder_times_if_empty()
     
+    def _migrate(self) -> None:
+        """升级已有数据库的结构。
+        
+        create_all 不会为已存在的表补建索引，这里手动创建；
+        同时将旧版本以文本存储的本地时间转换为 Unix 毫秒时间戳。
+        升级只执行一次，完成后记录在 user_version 中，避免每次启动都扫描全表。
+        """
+        with self.engine.begin() as conn:
+            version = conn.execute(text("PRAGMA user_version")).scalar()
+            if version >= _SCHEMA_VERSION:
+                return
+            conn.execute(text(
+                "UPDATE drink_records SET timestamp = "
+                "CAST(ROUND((julianday(timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER) "
+                "WHERE typeof(timestamp) = 'text'"
+            ))
+            conn.execute(text("DROP INDEX IF EXISTS ix_drink_records_timestamp"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_drink_records_timestamp_amount "
+                "ON drink_records(timestamp, amount)"
+            ))
+            conn.execute(text(f"PRAGMA user_version = {_SCHEMA_VERSION}"))
+    
     def _add_default_reminder_times_if_empty(self) -> None:
         """如果没有设置提醒时间点，添加默认时间点。"""
         with self.Session() as session:
@@ -75,6 +251,7 @@ class DatabaseManager:
                 for t in default_times:
                     session.add(ReminderTime(time=t))
                 session.commit()
+                self._reminder_cache = None
     
     def add_record(self, amount: int, note: str = "") -> None:
         """添加新的饮水记录。
@@ -88,16 +265,52 @@ class DatabaseManager:
             session.add(record)
             session.commit()
     
+    def get_writer(self) -> DatabaseWriter:
+        """获取后台写入对象，首次调用时启动写入线程。
+        
+        Returns:
+            DatabaseWriter: 后台写入对象
+        """
+        if self._writer is None:
+            self._writer_thread = QThread()
+            self._writer = DatabaseWriter(self.Session, self._write_queue)
+            self._writer.moveToThread(self._writer_thread)
+            self._writer_thread.started.connect(self._writer.run)
+            self._writer_thread.start()
+        return self._writer
+    
+    def enqueue_add_record(self, amount: int, note: str = "") -> None:
+        """将新的饮水记录交给后台线程写入。
+        
+        记录时间在调用时确定，写入完成后 writer 发出 recorded 信号。
+        
+        Args:
+            amount: 饮水量(ml)
+            note: 可选的备注信息
+        """
+        self.get_writer()
+        self._write_queue.put((amount, note, _now_ms()))
+    
+    def stop_writer(self) -> None:
+        """写入剩余记录并停止后台写入线程，应在程序退出前调用。"""
+        if self._writer_thread is None:
+            return
+        self._write_queue.put(None)
+        self._writer_thread.quit()
+        self._writer_thread.wait()
+        self._writer_thread = None
+        self._writer = None
+    
     def get_today_records(self) -> list[DrinkRecord]:
         """获取今天的所有饮水记录。
         
         Returns:
             list[DrinkRecord]: 今天的饮水记录列表
         """
-        today = datetime.now().date()
+        start = _day_start_ms(datetime.now().date())
         with self.Session() as session:
             return session.query(DrinkRecord).filter(
-                DrinkRecord.timestamp >= today
+                DrinkRecord.timestamp >= start
             ).all()
     
     def get_total_today(self) -> int:
@@ -106,8 +319,31 @@ class DatabaseManager:
         Returns:
             int: 总饮水量(ml)
         """
-        records = self.get_today_records()
-        return sum(record.amount for record in records)
+        with self.Session() as session:
+            return self._query_total_today(session)
+    
+    def _query_total_today(self, session: Session) -> int:
+        """在给定会话中查询今日总饮水量。"""
+        start = _day_start_ms(datetime.now().date())
+        return session.query(
+            func.coalesce(func.sum(DrinkRecord.amount), 0)
+        ).filter(
+            DrinkRecord.timestamp >= start
+        ).scalar()
+    
+    def get_dashboard_state(self) -> Tuple[int, Tuple[time, ...]]:
+        """获取主窗口显示所需的数据。
+        
+        在同一个会话中查询今日总饮水量和提醒时间点，减少会话创建次数。
+        
+        Returns:
+            Tuple[int, Tuple[time, ...]]: 今日总饮水量(ml)和按时间排序的提醒时间点
+        """
+        with self.Session() as session:
+            total = self._query_total_today(session)
+            if self._reminder_cache is None:
+                self._reminder_cache = self._query_reminder_times(session)
+        return total, self._reminder_cache
         
     def get_weekly_data(self) -> List[Tuple[str, int]]:
         """获取过去一周的每日饮水量数据。
@@ -120,51 +356,50 @@ class DatabaseManager:
             today = datetime.now().date()
             start_date = today - timedelta(days=6)  # 包括今天在内的7天
             
-            # 使用原生SQL查询按日期分组统计
-            # SQLAlchemy的分组查询在这里较为复杂，使用原生SQL更直观
-            conn = sqlite3.connect('drink_records.db')
-            cursor = conn.cursor()
-            
-            # 准备查询，按日期分组获取每天的总饮水量
-            query = """
-            SELECT date(timestamp) as day, SUM(amount) as total
+            # 使用原生SQL按日期分组统计，日期格式化在 SQLite 中完成
+            query = text("""
+            SELECT strftime('%m-%d', timestamp / 1000, 'unixepoch', 'localtime') as day,
+                   SUM(amount) as total
             FROM drink_records
-            WHERE date(timestamp) >= ?
+            WHERE timestamp >= :start
             GROUP BY day
-            ORDER BY day
-            """
+            """)
             
-            cursor.execute(query, (start_date.isoformat(),))
-            results = cursor.fetchall()
-            conn.close()
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {"start": _day_start_ms(start_date)}).fetchall()
             
             # 确保所有7天都有数据，没有记录的日期设为0
-            date_dict = {(start_date + timedelta(days=i)).strftime('%m-%d'): 0 for i in range(7)}
-            
-            # 更新有记录的日期
-            for day_str, amount in results:
-                # 将日期格式从 YYYY-MM-DD 转换为 MM-DD
-                day = datetime.strptime(day_str, '%Y-%m-%d').strftime('%m-%d')
-                date_dict[day] = amount
-            
-            # 转换为有序列表
-            return [(day, amount) for day, amount in date_dict.items()]
+            labels = [(start_date + timedelta(days=i)).strftime('%m-%d') for i in range(7)]
+            amounts = [0] * 7
+            for day, total in rows:
+                if day in labels:  # 忽略时间晚于今天的记录
+                    amounts[labels.index(day)] = total
+            return list(zip(labels, amounts))
             
         except Exception as e:
             print(f"获取周数据时出错: {e}")
             return [(datetime.now().strftime('%m-%d'), 0)]  # 返回空数据 
     
-    def get_reminder_times(self) -> List[time]:
-        """获取所有提醒时间点。
+    def get_reminder_times(self) -> Tuple[time, ...]:
+        """获取所有提醒时间点（带缓存）。
+        
+        返回的元组为共享的缓存对象，调用方需要修改时应先复制为列表。
         
         Returns:
-            List[time]: 提醒时间点列表
+            Tuple[time, ...]: 按时间排序的提醒时间点
         """
-        with self.Session() as session:
-            reminder_times = session.query(ReminderTime).all()
-            return [rt.time for rt in reminder_times]
+        if self._reminder_cache is None:
+            with self.Session() as session:
+                self._reminder_cache = self._query_reminder_times(session)
+        return self._reminder_cache
     
-    def get_day_records(self, date: datetime) -> List[Tuple[str, int]]:
+    def _query_reminder_times(self, session: Session) -> Tuple[time, ...]:
+        """在给定会话中查询按时间排序的提醒时间点。"""
+        return tuple(
+            rt.time for rt in session.query(ReminderTime).order_by(ReminderTime.time)
+        )
+    
+    def get_day_records(self, date: date) -> List[Tuple[str, int]]:
         """获取特定日期的饮水记录，按小时分组。
         
         Args:
@@ -175,45 +410,32 @@ class DatabaseManager:
         """
         try:
             # 计算日期的开始和结束时间
-            start_time = datetime.combine(date.date(), time.min)
-            end_time = datetime.combine(date.date(), time.max)
-            
-            # 使用原生SQL查询按小时分组统计
-            conn = sqlite3.connect('drink_records.db')
-            cursor = conn.cursor()
+            start_time = _day_start_ms(date)
+            end_time = _day_start_ms(date + timedelta(days=1))
             
-            # 准备查询，按小时分组获取每小时的总饮水量
-            query = """
-            SELECT strftime('%H', timestamp) as hour, SUM(amount) as total
+            # 按小时分组统计，小时直接以整数返回
+            query = text("""
+            SELECT CAST(strftime('%H', timestamp / 1000, 'unixepoch', 'localtime') AS INTEGER)
+                       as hour,
+                   SUM(amount) as total
             FROM drink_records
-            WHERE timestamp >= ? AND timestamp <= ?
+            WHERE timestamp >= :start AND timestamp < :end
             GROUP BY hour
-            ORDER BY hour
-            """
+            """)
             
-            cursor.execute(
-                query,
-                (
-                    start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    end_time.strftime('%Y-%m-%d %H:%M:%S')
-                )
-            )
-            results = cursor.fetchall()
-            conn.close()
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {"start": start_time, "end": end_time}).fetchall()
             
             # 确保24小时都有数据，没有记录的小时设为0
-            hour_dict = {f"{i:02d}" : 0 for i in range(24)}
-            
-            # 更新有记录的小时
-            for hour, amount in results:
-                hour_dict[hour] = amount
+            amounts = [0] * 24
+            for hour, total in rows:
+                amounts[hour] = total
             
-            # 转换为有序列表
-            return [(f"{hour}:00", amount) for hour, amount in hour_dict.items()]
+            return list(zip(_HOUR_LABELS, amounts))
             
         except Exception as e:
             print(f"获取日数据时出错: {e}")
-            return [(f"{i:02d}:00", 0) for i in range(24)]  # 返回空数据
+            return [(label, 0) for label in _HOUR_LABELS]  # 返回空数据
     
     def add_reminder_time(self, reminder_time: time) -> bool:
         """添加新的提醒时间点。
@@ -225,18 +447,13 @@ class DatabaseManager:
             bool: 是否添加成功
         """
         try:
-            with self.Session() as session:
-                # 检查是否已存在相同时间点
-                existing = session.query(ReminderTime).filter(
-                    ReminderTime.time == reminder_time
-                ).first()
-                
-                if existing:
-                    return False  # 已存在相同时间点
-                
-                session.add(ReminderTime(time=reminder_time))
-                session.commit()
-                return True
+            # 已存在相同时间点时由唯一约束忽略插入，只需一条语句
+            stmt = insert(ReminderTime).prefix_with('OR IGNORE').values(time=reminder_time)
+            with self.engine.begin() as conn:
+                added = conn.execute(stmt).rowcount == 1
+            if added:
+                self._reminder_cache = None
+            return added
         except Exception as e:
             print(f"添加提醒时间点时出错: {e}")
             return False
@@ -251,17 +468,39 @@ class DatabaseManager:
             bool: 是否删除成功
         """
         try:
-            with self.Session() as session:
-                time_obj = session.query(ReminderTime).filter(
-                    ReminderTime.time == reminder_time
-                ).first()
-                
-                if not time_obj:
-                    return False
-                
-                session.delete(time_obj)
-                session.commit()
-                return True
+            stmt = delete(ReminderTime).where(ReminderTime.time == reminder_time)
+            with self.engine.begin() as conn:
+                deleted = conn.execute(stmt).rowcount == 1
+            if deleted:
+                self._reminder_cache = None
+            return deleted
         except Exception as e:
             print(f"删除提醒时间点时出错: {e}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def replace_reminder_times_diff(self, added: Set[time], removed: Set[time]) -> bool:
+        """按差异更新提醒时间点。
+        
+        只删除被移除的时间点并插入新增的时间点，两者在同一个事务中完成。
+        
+        Args:
+            added: 新增的提醒时间点
+            removed: 被移除的提醒时间点
+            
+        Returns:
+            bool: 是否保存成功
+        """
+        if not added and not removed:
+            return True
+        
+        try:
+            with self.engine.begin() as conn:
+                if removed:
+                    conn.execute(delete(ReminderTime).where(ReminderTime.time.in_(removed)))
+                if added:
+                    conn.execute(insert(ReminderTime), [{"time": t} for t in added])
+            self._reminder_cache = None
+            return True
+        except Exception as e:
+            print(f"保存提醒时间点时出错: {e}")
+            return False
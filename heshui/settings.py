@@ -2,7 +2,6 @@
 
 提供应用程序设置界面。
 """
-from datetime import time
 from typing import Dict, Any, List
 import os
 import sys
@@ -28,8 +27,7 @@ class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.config = Config()
-        self.db = DatabaseManager()
-        self.reminder_times = self.db.get_reminder_times()
+        self.db = DatabaseManager.instance()
         self.initUI()
         self.loadSettings()
     
@@ -119,14 +117,23 @@ class SettingsDialog(QDialog):
         if HAS_WIN32API:
             self.autostart_check.setChecked(settings.get('autostart', False))
         
-        # 加载提醒时间点
+        # 加载提醒时间点，使用集合以便快速查找和删除
+        self.reminder_times = set(self.db.get_reminder_times())
         self.updateTimeList()
     
     def updateTimeList(self) -> None:
         """更新时间点列表。"""
-        self.time_list.clear()
-        for t in sorted(self.reminder_times):
-            self.time_list.addItem(t.strftime("%H:%M"))
+        # 批量替换列表内容，期间暂停重绘和信号
+        self.time_list.setUpdatesEnabled(False)
+        self.time_list.blockSignals(True)
+        try:
+            # 保存与列表行一一对应的 time 对象，删除时按行号取回，无需解析文本
+            self._sorted_times = sorted(self.reminder_times)
+            self.time_list.clear()
+            self.time_list.addItems([t.strftime("%H:%M") for t in self._sorted_times])
+        finally:
+            self.time_list.blockSignals(False)
+            self.time_list.setUpdatesEnabled(True)
     
     def addReminderTime(self) -> None:
         """添加新的提醒时间点。"""
@@ -137,7 +144,7 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(self, "添加失败", "该时间点已存在")
             return
         
-        self.reminder_times.append(new_time)
+        self.reminder_times.add(new_time)
         self.updateTimeList()
     
     def deleteReminderTime(self) -> None:
@@ -153,12 +160,7 @@ class SettingsDialog(QDialog):
             return
         
         for item in selected_items:
-            time_str = item.text()
-            hour, minute = map(int, time_str.split(':'))
-            time_obj = time(hour, minute)
-            
-            if time_obj in self.reminder_times:
-                self.reminder_times.remove(time_obj)
+            self.reminder_times.discard(self._sorted_times[self.time_list.row(item)])
         
         self.updateTimeList()
     
@@ -184,28 +186,32 @@ class SettingsDialog(QDialog):
             elif app_path.endswith('.exe'):
                 app_path = f'"{app_path}"'
                 
-            # 打开注册表
+            # 打开注册表，同时申请读写权限以便先检查当前值
             key = win32api.RegOpenKey(
                 win32con.HKEY_CURRENT_USER,
                 r'Software\Microsoft\Windows\CurrentVersion\Run',
                 0, 
-                win32con.KEY_SET_VALUE
+                win32con.KEY_READ | win32con.KEY_SET_VALUE
             )
             
             app_name = "HeShuiApp"
             
-            if enable:
-                # 设置开机自启动
-                win32api.RegSetValueEx(key, app_name, 0, win32con.REG_SZ, app_path)
-            else:
-                # 取消开机自启动
+            try:
+                # 读取现有值，状态未变化时不写注册表
                 try:
-                    win32api.RegDeleteValue(key, app_name)
+                    current_path, _ = win32api.RegQueryValueEx(key, app_name)
                 except Exception:
-                    # 如果键不存在，忽略错误
-                    pass
-                    
-            win32api.RegCloseKey(key)
+                    current_path = None
+                
+                if enable:
+                    # 设置开机自启动
+                    if current_path != app_path:
+                        win32api.RegSetValueEx(key, app_name, 0, win32con.REG_SZ, app_path)
+                elif current_path is not None:
+                    # 取消开机自启动
+                    win32api.RegDeleteValue(key, app_name)
+            finally:
+                win32api.RegCloseKey(key)
             return True
         except Exception as e:
             print(f"设置开机自启动失败: {e}")
@@ -226,17 +232,12 @@ class SettingsDialog(QDialog):
             settings['autostart'] = autostart
             self.set_autostart(autostart)
         
-        for key, value in settings.items():
-            self.config.set(key, value)
-        
-        # 保存提醒时间点
-        # 先删除所有现有时间点
-        current_times = self.db.get_reminder_times()
-        for t in current_times:
-            self.db.delete_reminder_time(t)
+        self.config.update(settings)
         
-        # 添加新的时间点
-        for t in self.reminder_times:
-            self.db.add_reminder_time(t)
+        # 保存提醒时间点，只写入发生变化的部分，未修改时不访问数据库
+        old_times = set(self.db.get_reminder_times())
+        new_times = self.reminder_times
+        if old_times != new_times:
+            self.db.replace_reminder_times_diff(new_times - old_times, old_times - new_times)
         
         self.accept() 
\ No newline at end of file
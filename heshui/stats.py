@@ -3,55 +3,86 @@
 提供饮水数据的统计图表功能。
 """
 from typing import List, Tuple
-import traceback
+import logging
 import sys
-from datetime import datetime, timedelta
+from datetime import date
 
-try:
-    import matplotlib
-    # 在导入其他 matplotlib 模块之前设置后端
-    matplotlib.use('QtAgg')  # 使用通用的 QtAgg 后端，它会自动选择合适的 Qt 版本
-    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-    from matplotlib.figure import Figure
-    import matplotlib.pyplot as plt
-except ImportError as e:
-    print(f"导入 matplotlib 时出错: {e}")
-    traceback.print_exc()
-
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
                            QHBoxLayout, QPushButton, QDateEdit,
                            QTabWidget)
 
+from heshui.config import Config
 from heshui.models import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
+# matplotlib 和 numpy 导入较慢，在第一次创建图表时才由 _load_mpl() 加载
+np = None
+Figure = None
+FigureCanvasQTAgg = None
+
+# 合并刷新请求的等待时间（毫秒）
+_REFRESH_DELAY = 120
 
-class MatplotlibCanvas(FigureCanvasQTAgg):
-    """Matplotlib画布类，用于在Qt界面中嵌入matplotlib图表。"""
+# 周视图和日视图的横坐标，分别为一周中的7天和一天中的24个小时，随 numpy 一起加载
+_WEEK_DAYS = None
+_HOURS = None
+
+# 数值标注的文本框样式，所有标注共用
+_ANNOT_BBOX = dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8)
+
+
+def _load_mpl() -> None:
+    """导入 matplotlib 和 numpy，并设置中文字体支持。
+    
+    只在第一次调用时执行，之后直接返回。rcParams 是进程级的全局设置，
+    同时预先查找字体，让字体缓存在创建第一个图表之前就准备好。
+    """
+    global np, Figure, FigureCanvasQTAgg, _WEEK_DAYS, _HOURS
+    if Figure is not None:
+        return
     
-    def __init__(self, width: int = 5, height: int = 4, dpi: int = 100):
-        """初始化画布。
+    import numpy
+    import matplotlib
+    # 直接使用 QtAgg 画布类，不经过 pyplot，因此无需切换全局后端，
+    # 也不会覆盖通过 MPLBACKEND 等方式预先指定的后端
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as canvas_class
+    from matplotlib.figure import Figure as figure_class
+    from matplotlib import font_manager
+    
+    try:
+        matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun', 'sans-serif']  # 尝试多种中文字体
+        matplotlib.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
+        font_manager.findfont(font_manager.FontProperties(family=['sans-serif']))
+    except Exception:
+        logger.exception("设置中文字体支持时出错")
+    
+    np = numpy
+    _WEEK_DAYS = np.arange(7)
+    _HOURS = np.arange(24)
+    FigureCanvasQTAgg = canvas_class
+    Figure = figure_class
+
+
+def _create_canvas(width: int = 5, height: int = 4, dpi: int = 100) -> 'FigureCanvasQTAgg':
+    """创建用于在Qt界面中嵌入matplotlib图表的画布。
+    
+    Args:
+        width: 图表宽度（英寸）
+        height: 图表高度（英寸）
+        dpi: 分辨率（每英寸点数）
         
-        Args:
-            width: 图表宽度（英寸）
-            height: 图表高度（英寸）
-            dpi: 分辨率（每英寸点数）
-        """
-        try:
-            self.fig = Figure(figsize=(width, height), dpi=dpi)
-            self.axes = self.fig.add_subplot(111)
-            super().__init__(self.fig)
-            
-            # 设置中文字体支持
-            try:
-                plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun', 'sans-serif']  # 尝试多种中文字体
-                plt.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
-            except Exception as e:
-                print(f"设置中文字体支持时出错: {e}")
-        except Exception as e:
-            print(f"初始化 MatplotlibCanvas 时出错: {e}")
-            traceback.print_exc()
-            raise
+    Returns:
+        FigureCanvasQTAgg: 画布对象，fig 和 axes 属性分别为图表和坐标轴
+    """
+    _load_mpl()
+    # 使用 constrained 布局，绘制时自动调整，无需每次更新后调用 tight_layout
+    fig = Figure(figsize=(width, height), dpi=dpi, layout='constrained')
+    canvas = FigureCanvasQTAgg(fig)
+    canvas.fig = fig
+    canvas.axes = fig.add_subplot(111)
+    return canvas
 
 
 class WeeklyStatsWidget(QWidget):
@@ -63,150 +94,201 @@ class WeeklyStatsWidget(QWidget):
         Args:
             parent: 父窗口
         """
-        try:
-            super().__init__(parent)
-            self.db = DatabaseManager()
-            self.initUI()
-            self.updateChart()
-        except Exception as e:
-            print(f"初始化 WeeklyStatsWidget 时出错: {e}")
-            traceback.print_exc()
-            raise
+        super().__init__(parent)
+        self.db = DatabaseManager.instance()
+        self.config = Config()
+        self._initRefreshTimer()
+        self.initUI()
     
     def initUI(self) -> None:
         """初始化用户界面。"""
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = QLabel("本周饮水量统计")
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title_font = title_label.font()
+        title_font.setPointSize(14)
+        title_font.setBold(True)
+        title_label.setFont(title_font)
+        layout.addWidget(title_label)
+        
+        # 图表
         try:
-            layout = QVBoxLayout(self)
-            
-            # 标题
-            title_label = QLabel("本周饮水量统计")
-            title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            title_font = title_label.font()
-            title_font.setPointSize(14)
-            title_font.setBold(True)
-            title_label.setFont(title_font)
-            layout.addWidget(title_label)
-            
-            # 图表
-            try:
-                self.chart_canvas = MatplotlibCanvas(width=6, height=4)
-                layout.addWidget(self.chart_canvas)
-            except Exception as e:
-                print(f"创建图表画布时出错: {e}")
-                error_label = QLabel(f"无法创建图表: {str(e)}")
-                error_label.setWordWrap(True)
-                error_label.setStyleSheet("color: red;")
-                layout.addWidget(error_label)
-            
-            # 刷新按钮
-            button_layout = QHBoxLayout()
-            refresh_btn = QPushButton("刷新数据")
-            refresh_btn.clicked.connect(self.updateChart)
-            button_layout.addStretch()
-            button_layout.addWidget(refresh_btn)
-            layout.addLayout(button_layout)
-            
-            # 添加一些底部空间
-            layout.addStretch()
+            self.chart_canvas = _create_canvas(width=6, height=4)
+            self.initChart()
+            layout.addWidget(self.chart_canvas)
         except Exception as e:
-            print(f"初始化 WeeklyStatsWidget UI 时出错: {e}")
-            traceback.print_exc()
+            logger.exception("创建图表画布时出错")
+            error_label = QLabel(f"无法创建图表: {str(e)}")
+            error_label.setWordWrap(True)
+            error_label.setStyleSheet("color: red;")
+            layout.addWidget(error_label)
+        
+        # 刷新按钮
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("刷新数据")
+        refresh_btn.clicked.connect(self.updateChart)
+        button_layout.addStretch()
+        button_layout.addWidget(refresh_btn)
+        layout.addLayout(button_layout)
+        
+        # 添加一些底部空间
+        layout.addStretch()
+    
+    def initChart(self) -> None:
+        """创建图表元素。
+        
+        曲线、标注、目标线等元素只创建一次，更新数据时直接修改，不再清除整个坐标轴。
+        """
+        axes = self.chart_canvas.axes
+        
+        # 曲线图，横坐标固定为一周的7天，更新时只修改纵坐标
+        self._line, = axes.plot(
+            _WEEK_DAYS, 
+            np.zeros(7), 
+            marker='o',  # 添加圆形标记点
+            linestyle='-',  # 实线
+            linewidth=2,  # 线宽
+            color='#2196F3',  # 使用应用主题色
+            markersize=8,  # 标记点大小
+            visible=False
+        )
+        
+        # 曲线下方的填充区域，随数据重新生成
+        self._fill = None
+        
+        # 每个数据点的数值标注，有数据时才显示
+        self._annotations = [
+            axes.annotate(
+                "",
+                (day, 0),
+                textcoords="offset points",  # 使用偏移坐标
+                xytext=(0, 10),  # 文本偏移量（上方10个点）
+                ha='center',  # 水平居中对齐
+                fontsize=9,  # 字体大小
+                bbox=_ANNOT_BBOX,  # 添加文本框
+                visible=False
+            )
+            for day in _WEEK_DAYS
+        ]
+        
+        # 设置图表标题和标签
+        axes.set_title("每日饮水量趋势")
+        axes.set_xlabel("日期")
+        axes.set_ylabel("饮水量 (ml)")
+        
+        # 横坐标刻度位置固定，刻度标签在更新数据时设置
+        axes.set_xticks(_WEEK_DAYS, [""] * 7)
+        
+        # 设置网格线
+        axes.grid(True, linestyle='--', alpha=0.7)
+        
+        # 添加目标线，目标值在更新数据时设置
+        self._goal_line = axes.axhline(y=0, color='r', linestyle='--', alpha=0.7)
+        self._daily_goal = None
+        
+        # 加载出错时显示的错误信息
+        self._error_text = axes.text(
+            0.5, 0.5, 
+            "", 
+            horizontalalignment='center',
+            verticalalignment='center',
+            transform=axes.transAxes,
+            visible=False
+        )
+    
+    def _initRefreshTimer(self) -> None:
+        """创建合并刷新请求的定时器。"""
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self._do_update_chart)
+    
+    def showEvent(self, event) -> None:
+        """显示时刷新图表。"""
+        super().showEvent(event)
+        self.updateChart()
     
     def updateChart(self) -> None:
+        """请求更新图表。
+        
+        隐藏时不绘制，显示时再刷新；短时间内的多次请求合并为一次绘制。
+        """
+        if self.isVisible():
+            self._refresh_timer.start()
+    
+    def _do_update_chart(self) -> None:
         """更新图表数据。"""
         if not hasattr(self, 'chart_canvas'):
-            print("图表画布不存在，无法更新图表")
+            logger.warning("图表画布不存在，无法更新图表")
             return
-            
+        
+        axes = self.chart_canvas.axes
         try:
             # 获取周数据
             weekly_data = self.db.get_weekly_data()
             
-            # 清除当前图表
-            self.chart_canvas.axes.clear()
-            
-            # 准备数据
-            dates = [item[0] for item in weekly_data]
-            amounts = [item[1] for item in weekly_data]
-            
-            # 绘制曲线图
-            self.chart_canvas.axes.plot(
-                dates, 
-                amounts, 
-                marker='o',  # 添加圆形标记点
-                linestyle='-',  # 实线
-                linewidth=2,  # 线宽
-                color='#2196F3',  # 使用应用主题色
-                markersize=8  # 标记点大小
-            )
-            
-            # 为每个数据点添加数值标注
-            for i, (date, amount) in enumerate(zip(dates, amounts)):
-                self.chart_canvas.axes.annotate(
-                    f"{amount}ml",  # 显示的文本
-                    (date, amount),  # 标注位置
-                    textcoords="offset points",  # 使用偏移坐标
-                    xytext=(0, 10),  # 文本偏移量（上方10个点）
-                    ha='center',  # 水平居中对齐
-                    fontsize=9,  # 字体大小
-                    bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8)  # 添加文本框
-                )
-            
-            # 填充曲线下方区域
-            self.chart_canvas.axes.fill_between(
-                dates, 
+            # 准备数据，按位置填入固定长度的数组
+            count = min(len(weekly_data), 7)
+            labels = [item[0] for item in weekly_data[:count]] + [""] * (7 - count)
+            amounts = np.zeros(7, dtype=np.int32)
+            amounts[:count] = [item[1] for item in weekly_data[:count]]
+            
+            # 更新曲线和日期标签
+            self._line.set_ydata(amounts)
+            self._line.set_visible(True)
+            self._error_text.set_visible(False)
+            axes.set_xticklabels(labels)
+            
+            # 更新数值标注
+            for annotation, day, amount in zip(self._annotations, _WEEK_DAYS, amounts.tolist()):
+                annotation.xy = (day, amount)
+                annotation.set_text(f"{amount}ml")
+                annotation.set_visible(day < count)
+            
+            # 重新填充曲线下方区域
+            if self._fill is not None:
+                self._fill.remove()
+            self._fill = axes.fill_between(
+                _WEEK_DAYS, 
                 amounts, 
                 alpha=0.2,  # 透明度
                 color='#2196F3'  # 使用应用主题色
             )
             
-            # 设置图表标题和标签
-            self.chart_canvas.axes.set_title("每日饮水量趋势")
-            self.chart_canvas.axes.set_xlabel("日期")
-            self.chart_canvas.axes.set_ylabel("饮水量 (ml)")
-            
-            # 设置网格线
-            self.chart_canvas.axes.grid(True, linestyle='--', alpha=0.7)
-            
-            # 获取每日目标
-            from heshui.config import Config
-            daily_goal = Config().get('daily_goal')
-            
-            # 添加目标线
-            self.chart_canvas.axes.axhline(
-                y=daily_goal, 
-                color='r', 
-                linestyle='--', 
-                alpha=0.7,
-                label=f"目标 ({daily_goal}ml)"
-            )
-            
-            # 添加图例
-            self.chart_canvas.axes.legend()
+            # 目标变化时更新目标线和图例
+            daily_goal = self.config.get('daily_goal')
+            if daily_goal != self._daily_goal:
+                self._daily_goal = daily_goal
+                self._goal_line.set_ydata([daily_goal, daily_goal])
+                self._goal_line.set_label(f"目标 ({daily_goal}ml)")
+                axes.legend()
             
-            # 自动调整布局
-            self.chart_canvas.fig.tight_layout()
+            # 按新数据调整坐标范围。relim 不统计填充区域，
+            # 需要手动包含 0，使纵轴与填充区域一样从 0 开始
+            axes.relim()
+            axes.update_datalim([(0, 0)], updatex=False)
+            axes.autoscale_view()
             
-            # 刷新画布
-            self.chart_canvas.draw()
+            # 请求重绘，由 Qt 合并到下一次绘制事件
+            self.chart_canvas.draw_idle()
             
         except Exception as e:
-            print(f"更新图表时出错: {e}")
-            traceback.print_exc()
-            # 显示错误信息
+            logger.exception("更新图表时出错")
+            # 隐藏数据并显示错误信息
             try:
-                self.chart_canvas.axes.clear()
-                self.chart_canvas.axes.text(
-                    0.5, 0.5, 
-                    f"加载数据时出错:\n{str(e)}", 
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    transform=self.chart_canvas.axes.transAxes
-                )
-                self.chart_canvas.draw()
-            except Exception as inner_e:
-                print(f"显示错误信息时出错: {inner_e}")
-                traceback.print_exc() 
+                self._line.set_visible(False)
+                for annotation in self._annotations:
+                    annotation.set_visible(False)
+                if self._fill is not None:
+                    self._fill.remove()
+                    self._fill = None
+                self._error_text.set_text(f"加载数据时出错:\n{str(e)}")
+                self._error_text.set_visible(True)
+                self.chart_canvas.draw_idle()
+            except Exception:
+                logger.exception("显示错误信息时出错")
 
 
 class DailyStatsWidget(QWidget):
@@ -218,68 +300,60 @@ class DailyStatsWidget(QWidget):
         Args:
             parent: 父窗口
         """
-        try:
-            super().__init__(parent)
-            self.db = DatabaseManager()
-            self.selected_date = datetime.now()
-            self.initUI()
-            self.updateChart()
-        except Exception as e:
-            print(f"初始化 DailyStatsWidget 时出错: {e}")
-            traceback.print_exc()
-            raise
+        super().__init__(parent)
+        self.db = DatabaseManager.instance()
+        self.selected_date = date.today()
+        self._initRefreshTimer()
+        self.initUI()
     
     def initUI(self) -> None:
         """初始化用户界面。"""
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = QLabel("每日饮水量详情")
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title_font = title_label.font()
+        title_font.setPointSize(14)
+        title_font.setBold(True)
+        title_label.setFont(title_font)
+        layout.addWidget(title_label)
+        
+        # 日期选择器
+        date_layout = QHBoxLayout()
+        date_label = QLabel("选择日期:")
+        self.date_edit = QDateEdit()
+        self.date_edit.setCalendarPopup(True)  # 允许弹出日历选择
+        self.date_edit.setDate(QDate.currentDate())  # 默认为当前日期
+        self.date_edit.dateChanged.connect(self.onDateChanged)
+        
+        date_layout.addWidget(date_label)
+        date_layout.addWidget(self.date_edit)
+        date_layout.addStretch()
+        layout.addLayout(date_layout)
+        
+        # 图表
         try:
-            layout = QVBoxLayout(self)
-            
-            # 标题
-            title_label = QLabel("每日饮水量详情")
-            title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            title_font = title_label.font()
-            title_font.setPointSize(14)
-            title_font.setBold(True)
-            title_label.setFont(title_font)
-            layout.addWidget(title_label)
-            
-            # 日期选择器
-            date_layout = QHBoxLayout()
-            date_label = QLabel("选择日期:")
-            self.date_edit = QDateEdit()
-            self.date_edit.setCalendarPopup(True)  # 允许弹出日历选择
-            self.date_edit.setDate(QDate.currentDate())  # 默认为当前日期
-            self.date_edit.dateChanged.connect(self.onDateChanged)
-            
-            date_layout.addWidget(date_label)
-            date_layout.addWidget(self.date_edit)
-            date_layout.addStretch()
-            layout.addLayout(date_layout)
-            
-            # 图表
-            try:
-                self.chart_canvas = MatplotlibCanvas(width=6, height=4)
-                layout.addWidget(self.chart_canvas)
-            except Exception as e:
-                print(f"创建图表画布时出错: {e}")
-                error_label = QLabel(f"无法创建图表: {str(e)}")
-                error_label.setWordWrap(True)
-                error_label.setStyleSheet("color: red;")
-                layout.addWidget(error_label)
-            
-            # 刷新按钮
-            button_layout = QHBoxLayout()
-            refresh_btn = QPushButton("刷新数据")
-            refresh_btn.clicked.connect(self.updateChart)
-            button_layout.addStretch()
-            button_layout.addWidget(refresh_btn)
-            layout.addLayout(button_layout)
-            
-            # 添加一些底部空间
-            layout.addStretch()
+            self.chart_canvas = _create_canvas(width=6, height=4)
+            self.initChart()
+            layout.addWidget(self.chart_canvas)
         except Exception as e:
-            print(f"初始化 DailyStatsWidget UI 时出错: {e}")
-            traceback.print_exc()
+            logger.exception("创建图表画布时出错")
+            error_label = QLabel(f"无法创建图表: {str(e)}")
+            error_label.setWordWrap(True)
+            error_label.setStyleSheet("color: red;")
+            layout.addWidget(error_label)
+        
+        # 刷新按钮
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("刷新数据")
+        refresh_btn.clicked.connect(self.updateChart)
+        button_layout.addStretch()
+        button_layout.addWidget(refresh_btn)
+        layout.addLayout(button_layout)
+        
+        # 添加一些底部空间
+        layout.addStretch()
     
     def onDateChanged(self, qdate: QDate) -> None:
         """日期改变时的处理函数。
@@ -287,98 +361,153 @@ class DailyStatsWidget(QWidget):
         Args:
             qdate: 新选择的日期
         """
-        try:
-            # 将 QDate 转换为 datetime
-            self.selected_date = datetime(qdate.year(), qdate.month(), qdate.day())
-            self.updateChart()
-        except Exception as e:
-            print(f"处理日期变更时出错: {e}")
-            traceback.print_exc()
+        self.selected_date = qdate.toPyDate()
+        self.updateChart()
+    
+    def initChart(self) -> None:
+        """创建图表元素。
+        
+        曲线、标注等元素只创建一次，更新数据时直接修改，不再清除整个坐标轴。
+        """
+        axes = self.chart_canvas.axes
+        
+        # 曲线图
+        self._line, = axes.plot(
+            [], 
+            [], 
+            marker='o',  # 添加圆形标记点
+            linestyle='-',  # 实线
+            linewidth=2,  # 线宽
+            color='#2196F3',  # 使用应用主题色
+            markersize=6  # 标记点大小
+        )
+        
+        # 曲线下方的填充区域，随数据重新生成
+        self._fill = None
+        
+        # 每小时的数值标注，只在有饮水记录时显示
+        self._annotations = [
+            axes.annotate(
+                "",
+                (hour, 0),
+                textcoords="offset points",  # 使用偏移坐标
+                xytext=(0, 10),  # 文本偏移量（上方10个点）
+                ha='center',  # 水平居中对齐
+                fontsize=9,  # 字体大小
+                bbox=_ANNOT_BBOX,  # 添加文本框
+                visible=False
+            )
+            for hour in _HOURS
+        ]
+        
+        # 设置图表标签
+        axes.set_xlabel("时间")
+        axes.set_ylabel("饮水量 (ml)")
+        
+        # 设置x轴刻度，每3小时显示一个
+        axes.set_xticks(_HOURS[::3], [f"{hour:02d}:00" for hour in _HOURS[::3]])
+        
+        # 设置网格线
+        axes.grid(True, linestyle='--', alpha=0.7)
+        
+        # 加载出错时显示的错误信息
+        self._error_text = axes.text(
+            0.5, 0.5, 
+            "", 
+            horizontalalignment='center',
+            verticalalignment='center',
+            transform=axes.transAxes,
+            visible=False
+        )
+    
+    def _initRefreshTimer(self) -> None:
+        """创建合并刷新请求的定时器。"""
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self._do_update_chart)
+    
+    def showEvent(self, event) -> None:
+        """显示时刷新图表。"""
+        super().showEvent(event)
+        self.updateChart()
     
     def updateChart(self) -> None:
+        """请求更新图表。
+        
+        隐藏时不绘制，显示时再刷新；短时间内的多次请求合并为一次绘制。
+        """
+        if self.isVisible():
+            self._refresh_timer.start()
+    
+    def _do_update_chart(self) -> None:
         """更新图表数据。"""
         if not hasattr(self, 'chart_canvas'):
-            print("图表画布不存在，无法更新图表")
+            logger.warning("图表画布不存在，无法更新图表")
             return
-            
+        
+        axes = self.chart_canvas.axes
         try:
             # 获取日数据
             daily_data = self.db.get_day_records(self.selected_date)
             
-            # 清除当前图表
-            self.chart_canvas.axes.clear()
+            # 准备数据，按小时填入固定长度的数组，缺少的小时为0
+            amounts = np.zeros(24, dtype=np.int32)
+            for hour_str, amount in daily_data:
+                amounts[int(hour_str[:2])] = amount
             
-            # 准备数据
-            hours = [item[0] for item in daily_data]
-            amounts = [item[1] for item in daily_data]
+            # 更新曲线
+            self._line.set_data(_HOURS, amounts)
+            self._line.set_visible(True)
+            self._error_text.set_visible(False)
             
-            # 绘制曲线图
-            self.chart_canvas.axes.plot(
-                hours, 
-                amounts, 
-                marker='o',  # 添加圆形标记点
-                linestyle='-',  # 实线
-                linewidth=2,  # 线宽
-                color='#2196F3',  # 使用应用主题色
-                markersize=6  # 标记点大小
-            )
-            
-            # 为非零数据点添加数值标注
-            for i, (hour, amount) in enumerate(zip(hours, amounts)):
+            # 为非零数据点显示数值标注
+            for annotation, hour, amount in zip(self._annotations, _HOURS, amounts.tolist()):
                 if amount > 0:  # 只为有饮水记录的时间点添加标注
-                    self.chart_canvas.axes.annotate(
-                        f"{amount}ml",  # 显示的文本
-                        (hour, amount),  # 标注位置
-                        textcoords="offset points",  # 使用偏移坐标
-                        xytext=(0, 10),  # 文本偏移量（上方10个点）
-                        ha='center',  # 水平居中对齐
-                        fontsize=9,  # 字体大小
-                        bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8)  # 添加文本框
-                    )
-            
-            # 填充曲线下方区域
-            self.chart_canvas.axes.fill_between(
-                hours, 
+                    annotation.xy = (hour, amount)
+                    annotation.set_text(f"{amount}ml")
+                    annotation.set_visible(True)
+                else:
+                    annotation.set_visible(False)
+            
+            # 重新填充曲线下方区域
+            if self._fill is not None:
+                self._fill.remove()
+            self._fill = axes.fill_between(
+                _HOURS, 
                 amounts, 
                 alpha=0.2,  # 透明度
                 color='#2196F3'  # 使用应用主题色
             )
             
-            # 设置图表标题和标签
+            # 设置图表标题
             date_str = self.selected_date.strftime('%Y-%m-%d')
-            self.chart_canvas.axes.set_title(f"{date_str} 饮水量分布")
-            self.chart_canvas.axes.set_xlabel("时间")
-            self.chart_canvas.axes.set_ylabel("饮水量 (ml)")
-            
-            # 设置网格线
-            self.chart_canvas.axes.grid(True, linestyle='--', alpha=0.7)
-            
-            # 设置x轴刻度，每3小时显示一个
-            self.chart_canvas.axes.set_xticks([hours[i] for i in range(0, 24, 3)])
+            axes.set_title(f"{date_str} 饮水量分布")
             
-            # 自动调整布局
-            self.chart_canvas.fig.tight_layout()
+            # 按新数据调整坐标范围。relim 不统计填充区域，
+            # 需要手动包含 0，使纵轴与填充区域一样从 0 开始
+            axes.relim()
+            axes.update_datalim([(0, 0)], updatex=False)
+            axes.autoscale_view()
             
-            # 刷新画布
-            self.chart_canvas.draw()
+            # 请求重绘，由 Qt 合并到下一次绘制事件
+            self.chart_canvas.draw_idle()
             
         except Exception as e:
-            print(f"更新日图表时出错: {e}")
-            traceback.print_exc()
-            # 显示错误信息
+            logger.exception("更新日图表时出错")
+            # 隐藏数据并显示错误信息
             try:
-                self.chart_canvas.axes.clear()
-                self.chart_canvas.axes.text(
-                    0.5, 0.5, 
-                    f"加载数据时出错:\n{str(e)}", 
-                    horizontalalignment='center',
-                    verticalalignment='center',
-                    transform=self.chart_canvas.axes.transAxes
-                )
-                self.chart_canvas.draw()
-            except Exception as inner_e:
-                print(f"显示错误信息时出错: {inner_e}")
-                traceback.print_exc()
+                self._line.set_visible(False)
+                for annotation in self._annotations:
+                    annotation.set_visible(False)
+                if self._fill is not None:
+                    self._fill.remove()
+                    self._fill = None
+                self._error_text.set_text(f"加载数据时出错:\n{str(e)}")
+                self._error_text.set_visible(True)
+                self.chart_canvas.draw_idle()
+            except Exception:
+                logger.exception("显示错误信息时出错")
 
 
 class StatsTabWidget(QTabWidget):
@@ -390,27 +519,53 @@ class StatsTabWidget(QTabWidget):
         Args:
             parent: 父窗口
         """
-        try:
-            super().__init__(parent)
-            self.initUI()
-        except Exception as e:
-            print(f"初始化 StatsTabWidget 时出错: {e}")
-            traceback.print_exc()
-            raise
+        super().__init__(parent)
+        self.initUI()
     
     def initUI(self) -> None:
-        """初始化用户界面。"""
+        """初始化用户界面。
+        
+        标签页先使用占位控件，首次切换到某个标签页时才创建对应的图表视图。
+        """
+        # 各标签页对应的视图类，创建后从字典中移除
+        self._tab_classes = {}
+        
+        # 添加周视图标签页
+        self.addTab(QWidget(self), "周视图")
+        self._tab_classes[0] = WeeklyStatsWidget
+        
+        # 添加日视图标签页
+        self.addTab(QWidget(self), "日视图")
+        self._tab_classes[1] = DailyStatsWidget
+        
+        self.currentChanged.connect(self.onCurrentChanged)
+        
+        # 设置默认显示的标签页
+        self.setCurrentIndex(0)
+        self.onCurrentChanged(0)
+    
+    def onCurrentChanged(self, index: int) -> None:
+        """切换标签页时，按需创建该标签页的视图。
+        
+        Args:
+            index: 当前标签页的索引
+        """
+        widget_class = self._tab_classes.pop(index, None)
+        if widget_class is None:
+            return
+        
         try:
-            # 添加周视图标签页
-            weekly_tab = WeeklyStatsWidget(self)
-            self.addTab(weekly_tab, "周视图")
+            placeholder = self.widget(index)
+            title = self.tabText(index)
             
-            # 添加日视图标签页
-            daily_tab = DailyStatsWidget(self)
-            self.addTab(daily_tab, "日视图")
-            
-            # 设置默认显示的标签页
-            self.setCurrentIndex(0)
-        except Exception as e:
-            print(f"初始化 StatsTabWidget UI 时出错: {e}")
-            traceback.print_exc() 
\ No newline at end of file
+            # 替换标签页时会改变当前索引，暂时屏蔽信号
+            self.blockSignals(True)
+            try:
+                self.removeTab(index)
+                self.insertTab(index, widget_class(self), title)
+                self.setCurrentIndex(index)
+            finally:
+                self.blockSignals(False)
+            placeholder.deleteLater()
+        except Exception:
+            logger.exception("创建统计视图时出错") 
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""测试公共配置。"""
+import os
+
+# 在 matplotlib 被导入之前通过环境变量指定非交互式后端
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import pytest
+from unittest.mock import patch, Mock
+
+import heshui.stats as _stats_mod
+
+
+@pytest.fixture(scope="session")
+def stats_mock_cls():
+    """替换统计模块中的 DatabaseManager，整个测试会话只替换一次。"""
+    with patch.object(_stats_mod, 'DatabaseManager', new_callable=Mock) as mock_cls:
+        yield mock_cls
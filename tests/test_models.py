@@ -0,0 +1,90 @@
+"""数据库模块测试。"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from heshui.models import DatabaseManager
+
+
+# 旧版本以文本保存本地时间的饮水记录
+_OLD_RECORDS = (
+    ('2020-01-01 10:00:00.000000', 100),
+    ('2024-06-30 23:59:59.250000', 250),
+)
+
+
+def _epoch_ms(text: str) -> int:
+    """将旧版本的本地时间文本转换为 Unix 毫秒时间戳。"""
+    return round(datetime.strptime(text, '%Y-%m-%d %H:%M:%S.%f').timestamp() * 1000)
+
+
+def _open_db() -> DatabaseManager:
+    """在当前目录打开数据库，并关闭连接池，便于之后直接检查文件。"""
+    DatabaseManager._instance = None
+    db = DatabaseManager()
+    db.engine.dispose()
+    return db
+
+
+@pytest.fixture
+def old_db(tmp_path, monkeypatch):
+    """在临时目录中创建旧结构的数据库文件。"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(DatabaseManager, '_instance', None)
+    
+    path = tmp_path / 'drink_records.db'
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE drink_records (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL, "
+        "amount INTEGER NOT NULL, note VARCHAR(200))"
+    )
+    conn.execute("CREATE TABLE reminder_times (id INTEGER PRIMARY KEY, time TIME NOT NULL UNIQUE)")
+    conn.execute("CREATE INDEX ix_drink_records_timestamp ON drink_records(timestamp)")
+    conn.executemany(
+        "INSERT INTO drink_records (timestamp, amount, note) VALUES (?, ?, '')", _OLD_RECORDS
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _read(path, sql):
+    """在独立连接中执行查询并返回所有结果。"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_migrate_converts_text_timestamps(old_db):
+    """测试旧版本的文本时间被转换为毫秒时间戳。"""
+    _open_db()
+    
+    rows = _read(old_db, "SELECT typeof(timestamp), timestamp, amount FROM drink_records ORDER BY id")
+    assert rows == [
+        ('integer', _epoch_ms(text), amount) for text, amount in _OLD_RECORDS
+    ]
+    
+    indexes = {name for name, in _read(old_db, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'ix_drink_records_timestamp_amount' in indexes
+    assert 'ix_drink_records_timestamp' not in indexes
+    
+    assert _read(old_db, "PRAGMA user_version") == [(1,)]
+
+
+def test_migrate_runs_only_once(old_db):
+    """测试升级完成后再次打开数据库不会修改已有记录。"""
+    _open_db()
+    # 升级后再写入一条文本时间，若再次执行升级它会被转换
+    conn = sqlite3.connect(old_db)
+    conn.execute("INSERT INTO drink_records (timestamp, amount, note) VALUES ('2020-01-02 08:00:00', 1, '')")
+    conn.commit()
+    conn.close()
+    migrated = _read(old_db, "SELECT id, timestamp, amount FROM drink_records ORDER BY id")
+    
+    _open_db()
+    
+    assert _read(old_db, "SELECT id, timestamp, amount FROM drink_records ORDER BY id") == migrated
+    assert _read(old_db, "PRAGMA user_version") == [(1,)]
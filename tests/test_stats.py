@@ -1,105 +1,136 @@
 """统计功能测试模块。"""
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock
 from datetime import datetime, timedelta
 
-# 在导入 WeeklyStatsWidget 之前先模拟 matplotlib
-import matplotlib
-matplotlib.use('Agg')  # 使用非交互式后端进行测试
+from PyQt6.QtCore import Qt
 
-from heshui.models import DatabaseManager
 from heshui.stats import WeeklyStatsWidget, DailyStatsWidget, StatsTabWidget
 
 
+# 模拟数据在导入时生成一次，所有测试共用
+_TODAY = datetime.now().date()
+
+# 过去7天的日期，从最早的一天开始
+_DAYS = tuple(_TODAY - timedelta(days=k) for k in range(6, -1, -1))
+
+# 过去7天的模拟数据，这里简单使用日期的天数作为数据
+_WEEKLY_DATA = tuple((day.strftime('%m-%d'), (day.day * 100) % 2000 + 500) for day in _DAYS)
+
+
+# 一天24小时的模拟数据，每隔3小时有一次饮水记录
+_DAILY = tuple((f"{i:02d}:00", (i * 50) % 500 if i % 3 == 0 else 0) for i in range(24))
+
+
+@pytest.fixture(scope="module")
+def _mock_db_module(stats_mock_cls):
+    """模拟数据库管理器，整个模块只创建一次。"""
+    db_instance = Mock()
+    stats_mock_cls.instance.return_value = db_instance
+    db_instance.get_weekly_data.return_value = _WEEKLY_DATA
+    db_instance.get_day_records.return_value = _DAILY
+    return db_instance
+
+
+@pytest.fixture(autouse=True)
+def mock_db(_mock_db_module):
+    """每个测试开始前清空调用记录。"""
+    _mock_db_module.reset_mock()
+    return _mock_db_module
+
+
+def _offscreen(widget):
+    """显示时不映射到屏幕，测试只检查数据，不需要真正绘制图表。"""
+    widget.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+    return widget
+
+
+def _reset_widget(widget):
+    """恢复为刚创建时的隐藏状态，测试结束后取消尚未执行的刷新。"""
+    widget.hide()
+    widget._refresh_timer.stop()
+    yield widget
+    widget._refresh_timer.stop()
+    widget.hide()
+
+
+@pytest.fixture(scope="module")
+def _weekly_widget_module(qapp, _mock_db_module):
+    """整个模块共用的周统计视图。"""
+    widget = _offscreen(WeeklyStatsWidget())
+    yield widget
+    widget.close()
+    widget.deleteLater()
+
+
+@pytest.fixture(scope="module")
+def _daily_widget_module(qapp, _mock_db_module):
+    """整个模块共用的日统计视图。"""
+    widget = _offscreen(DailyStatsWidget())
+    yield widget
+    widget.close()
+    widget.deleteLater()
+
+
 @pytest.fixture
-def mock_db():
-    """模拟数据库管理器。"""
-    with patch('heshui.stats.DatabaseManager') as mock:
-        db_instance = MagicMock()
-        mock.return_value = db_instance
-        
-        # 模拟周数据
-        today = datetime.now().date()
-        weekly_data = []
-        
-        # 生成过去7天的模拟数据
-        for i in range(7):
-            day = today - timedelta(days=6-i)
-            day_str = day.strftime('%m-%d')
-            # 生成一些随机数据，这里简单使用日期的天数作为数据
-            amount = (day.day * 100) % 2000 + 500
-            weekly_data.append((day_str, amount))
-        
-        db_instance.get_weekly_data.return_value = weekly_data
-        
-        # 模拟日数据
-        daily_data = []
-        for i in range(24):
-            hour_str = f"{i:02d}:00"
-            # 生成一些随机数据
-            amount = (i * 50) % 500 if i % 3 == 0 else 0  # 每隔3小时有一次饮水记录
-            daily_data.append((hour_str, amount))
-        
-        db_instance.get_day_records.return_value = daily_data
-        
-        yield db_instance
-
-
-def test_weekly_stats_widget_creation(qtbot, mock_db):
-    """测试周统计视图创建。"""
-    widget = WeeklyStatsWidget()
-    qtbot.addWidget(widget)
+def weekly_widget(_weekly_widget_module):
+    """周统计视图，每个测试前后重置状态。"""
+    yield from _reset_widget(_weekly_widget_module)
+
+
+@pytest.fixture
+def daily_widget(_daily_widget_module):
+    """日统计视图，每个测试前后重置状态。"""
+    yield from _reset_widget(_daily_widget_module)
+
+
+# 各统计视图的夹具名称和它使用的数据库查询方法
+_WIDGET_CASES = [
+    pytest.param("weekly_widget", "get_weekly_data", marks=pytest.mark.smoke, id="weekly"),
+    pytest.param("daily_widget", "get_day_records", id="daily"),
+]
+
+
+@pytest.mark.parametrize("widget_fixture, query", _WIDGET_CASES)
+def test_stats_widget_creation(request, mock_db, widget_fixture, query):
+    """测试统计视图创建。"""
+    widget = request.getfixturevalue(widget_fixture)
     
-    # 验证数据库方法被调用
-    mock_db.get_weekly_data.assert_called_once()
+    # 隐藏的视图不查询数据库
+    getattr(mock_db, query).assert_not_called()
     
     # 验证界面元素存在
-    assert hasattr(widget, 'chart_canvas')
     assert widget.chart_canvas is not None
 
 
-def test_weekly_stats_update_chart(qtbot, mock_db):
-    """测试更新图表功能。"""
-    widget = WeeklyStatsWidget()
-    qtbot.addWidget(widget)
+@pytest.mark.parametrize("widget_fixture, query", _WIDGET_CASES)
+def test_stats_widget_update_chart(qtbot, request, mock_db, widget_fixture, query):
+    """测试统计视图更新图表功能。"""
+    widget = request.getfixturevalue(widget_fixture)
     
-    # 重置模拟对象的调用计数
-    mock_db.get_weekly_data.reset_mock()
-    
-    # 调用更新方法
+    # 显示后多次请求更新只会启动一次延迟刷新
+    widget.show()
+    widget.updateChart()
     widget.updateChart()
+    assert widget._refresh_timer.isActive()
     
-    # 验证数据库方法被再次调用
-    mock_db.get_weekly_data.assert_called_once()
+    # 等待定时器执行刷新，验证数据库只被查询一次
+    qtbot.waitUntil(lambda: not widget._refresh_timer.isActive())
+    assert getattr(mock_db, query).call_count == 1
 
 
-def test_daily_stats_widget_creation(qtbot, mock_db):
-    """测试日统计视图创建。"""
-    widget = DailyStatsWidget()
-    qtbot.addWidget(widget)
+def test_weekly_stats_y_axis_starts_at_zero(weekly_widget):
+    """测试每天都有记录时，周视图的纵轴仍从 0 开始。"""
+    assert min(amount for _, amount in _WEEKLY_DATA) > 0
     
-    # 验证数据库方法被调用
-    mock_db.get_day_records.assert_called_once()
+    weekly_widget._do_update_chart()
     
-    # 验证界面元素存在
-    assert hasattr(widget, 'chart_canvas')
-    assert widget.chart_canvas is not None
-    assert hasattr(widget, 'date_edit')
+    assert weekly_widget.chart_canvas.axes.get_ylim()[0] <= 0
 
 
-def test_daily_stats_update_chart(qtbot, mock_db):
-    """测试日统计视图更新图表功能。"""
-    widget = DailyStatsWidget()
-    qtbot.addWidget(widget)
-    
-    # 重置模拟对象的调用计数
-    mock_db.get_day_records.reset_mock()
-    
-    # 调用更新方法
-    widget.updateChart()
-    
-    # 验证数据库方法被再次调用
-    mock_db.get_day_records.assert_called_once()
+def test_daily_stats_widget_date_edit(daily_widget):
+    """测试日统计视图包含日期选择控件。"""
+    assert daily_widget.date_edit is not None
 
 
 def test_stats_tab_widget_creation(qtbot, mock_db):
@@ -114,6 +145,11 @@ def test_stats_tab_widget_creation(qtbot, mock_db):
     assert widget.tabText(0) == "周视图"
     assert widget.tabText(1) == "日视图"
     
-    # 验证标签页内容
+    # 验证标签页内容，日视图在首次切换时才创建
     assert isinstance(widget.widget(0), WeeklyStatsWidget)
-    assert isinstance(widget.widget(1), DailyStatsWidget) 
\ No newline at end of file
+    assert not isinstance(widget.widget(1), DailyStatsWidget)
+    
+    widget.setCurrentIndex(1)
+    assert isinstance(widget.widget(1), DailyStatsWidget)
+    assert widget.currentIndex() == 1
+    assert widget.tabText(1) == "日视图" 
\ No newline at end of file